@@ -1,8 +1,11 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import numpy as np
 from numpy.typing import ArrayLike
-import pymap3d as pm
+
+# WGS84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_E2 = 6.6943799901377997e-3  # first eccentricity squared
 
 
 @dataclass(frozen=True)
@@ -10,34 +13,107 @@ class LonLatToENU:
     """
     Immutable converter from geodetic coordinates to ENU.
     Elevation is intentionally ignored (DEM provides height).
+
+    Uses a hand-vectorized geodetic<->ECEF kernel: the origin ECEF position
+    and the 3x3 ECEF->ENU rotation are precomputed once, so converting N
+    points is a couple of array passes plus one matmul.
     """
 
     lat0: float
     lon0: float
     h0: float
 
-    def lonlat_to_enu(self, lat: ArrayLike, lon: ArrayLike, ele: ArrayLike) -> np.ndarray:
+    _origin_ecef: np.ndarray = field(init=False, repr=False, compare=False)
+    _rotation: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        lat0_r = np.radians(self.lat0)
+        lon0_r = np.radians(self.lon0)
+        sin_lat, cos_lat = np.sin(lat0_r), np.cos(lat0_r)
+        sin_lon, cos_lon = np.sin(lon0_r), np.cos(lon0_r)
+
+        prime_vertical = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat**2)
+        origin = np.array(
+            [
+                (prime_vertical + self.h0) * cos_lat * cos_lon,
+                (prime_vertical + self.h0) * cos_lat * sin_lon,
+                ((1 - WGS84_E2) * prime_vertical + self.h0) * sin_lat,
+            ]
+        )
+        rotation = np.array(
+            [
+                [-sin_lon, cos_lon, 0.0],
+                [-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat],
+                [cos_lat * cos_lon, cos_lat * sin_lon, sin_lat],
+            ]
+        )
+        object.__setattr__(self, "_origin_ecef", origin)
+        object.__setattr__(self, "_rotation", rotation)
+
+    def lonlat_to_enu(self, lat: ArrayLike, lon: ArrayLike, ele: ArrayLike, dtype: np.dtype = np.float32) -> np.ndarray:
         """
         Convert lat/lon/ele to ENU coordinates.
+        Accepts arrays of any shape; returns shape + (3,).
+
+        Intermediate math runs in float64 (the ECEF origin subtraction needs
+        the precision); the output defaults to float32, which is millimeter
+        accurate over any printable bounding box at half the bandwidth.
         """
-        lat = np.asarray(lat, dtype=float)
-        lon = np.asarray(lon, dtype=float)
+        lat_r = np.radians(np.asarray(lat, dtype=float))
+        lon_r = np.radians(np.asarray(lon, dtype=float))
         ele = np.asarray(ele, dtype=float)
 
-        E, N, U = pm.geodetic2enu(lat, lon, ele, self.lat0, self.lon0, self.h0)
-        return np.vstack([E, N, U]).T
+        sin_lat = np.sin(lat_r)
+        prime_vertical = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat**2)
+        x = (prime_vertical + ele) * np.cos(lat_r) * np.cos(lon_r)
+        y = (prime_vertical + ele) * np.cos(lat_r) * np.sin(lon_r)
+        z = ((1 - WGS84_E2) * prime_vertical + ele) * sin_lat
 
-    def enu_to_lonlat(self, e: ArrayLike, n: ArrayLike, u: ArrayLike) -> np.ndarray:
+        xyz = np.stack([x - self._origin_ecef[0], y - self._origin_ecef[1], z - self._origin_ecef[2]])
+        E, N, U = np.tensordot(self._rotation, xyz, axes=1)
+
+        # C-contiguous output so downstream component slices are cheap views
+        out = np.empty(lat_r.shape + (3,), dtype=dtype)
+        out[..., 0] = E
+        out[..., 1] = N
+        out[..., 2] = U
+        return out
+
+    def enu_to_lonlat(self, e: ArrayLike, n: ArrayLike, u: ArrayLike, dtype: np.dtype = np.float64) -> np.ndarray:
         """
         Convert ENU coordinates back to lat/lon/ele.
-        Returns an (N, 3) array.
+        Accepts arrays of any shape; returns shape + (3,).
+        Keeps float64 output by default — degrees need the extra digits.
         """
         e = np.asarray(e, dtype=float)
         n = np.asarray(n, dtype=float)
         u = np.asarray(u, dtype=float)
 
-        lat, lon, ele = pm.enu2geodetic(e, n, u, self.lat0, self.lon0, self.h0)
-        return np.vstack([lat, lon, ele]).T
+        origin = self._origin_ecef.reshape((3,) + (1,) * e.ndim)
+        x, y, z = np.tensordot(self._rotation.T, np.stack([e, n, u]), axes=1) + origin
+
+        # Heikkinen's closed-form ECEF -> geodetic solution, fully vectorized
+        b2 = WGS84_A**2 * (1 - WGS84_E2)
+        ep2 = (WGS84_A**2 - b2) / b2
+        b = np.sqrt(b2)
+
+        r = np.hypot(x, y)
+        F = 54 * b2 * z**2
+        G = r**2 + (1 - WGS84_E2) * z**2 - WGS84_E2 * (WGS84_A**2 - b2)
+        c = WGS84_E2**2 * F * r**2 / G**3
+        s = np.cbrt(1 + c + np.sqrt(c**2 + 2 * c))
+        P = F / (3 * (s + 1 / s + 1) ** 2 * G**2)
+        Q = np.sqrt(1 + 2 * WGS84_E2**2 * P)
+        r0 = -P * WGS84_E2 * r / (1 + Q) + np.sqrt(0.5 * WGS84_A**2 * (1 + 1 / Q) - P * (1 - WGS84_E2) * z**2 / (Q * (1 + Q)) - 0.5 * P * r**2)
+        U_ = np.sqrt((r - WGS84_E2 * r0) ** 2 + z**2)
+        V = np.sqrt((r - WGS84_E2 * r0) ** 2 + (1 - WGS84_E2) * z**2)
+        z0 = b2 * z / (WGS84_A * V)
+
+        out = np.empty(e.shape + (3,), dtype=dtype)
+        out[..., 0] = np.degrees(np.arctan2(z + ep2 * z0, r))
+        out[..., 1] = np.degrees(np.arctan2(y, x))
+        out[..., 2] = U_ * (1 - b2 / (WGS84_A * V))
+        return out
 
     @classmethod
     def new(cls, origin: tuple[float, float, float]) -> LonLatToENU:
@@ -65,10 +141,26 @@ class LonLatToRasterTile:
         Returns:
             RasterTile with x, y tile indices
         """
-        n = 2**zoom
-        x_tile = int((lon + 180.0) / 360.0 * n)
-        
-        lat_rad = np.radians(lat)
-        y_tile = int((1.0 - np.arcsinh(np.tan(lat_rad)) / np.pi) / 2.0 * n)
+        x_tiles, y_tiles = self.lonlat_to_tiles(np.asarray([lon]), np.asarray([lat]), zoom)
+        return RasterTile(zoom=zoom, x=int(x_tiles[0]), y=int(y_tiles[0]))
+
+    def lonlat_to_tiles(self, lons: np.ndarray, lats: np.ndarray, zoom: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Batched version of lonlat_to_tile: convert arrays of lon/lat to tile
+        x/y index arrays in one vectorized pass.
+
+        Args:
+            lons: Longitudes in degrees
+            lats: Latitudes in degrees
+            zoom: Zoom level
+
+        Returns:
+            Tuple of (x, y) int64 tile index arrays
+        """
+        n = 1 << zoom
+        x_tiles = ((np.asarray(lons, dtype=float) + 180.0) / 360.0 * n).astype(np.int64)
+
+        lat_rad = np.radians(np.asarray(lats, dtype=float))
+        y_tiles = ((1.0 - np.arcsinh(np.tan(lat_rad)) / np.pi) / 2.0 * n).astype(np.int64)
 
-        return RasterTile(zoom=zoom, x=x_tile, y=y_tile)
\ No newline at end of file
+        return x_tiles, y_tiles
\ No newline at end of file
@@ -1,15 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tile_client import MapboxTileClient, decode_terrain_rgb
 import numpy as np
 from route import RasterTile
 
 
-def create_heightmap_from_tiles(client: MapboxTileClient, tile_coords: list[RasterTile]) -> np.ndarray:
+def _load_tile(client: MapboxTileClient, tile: RasterTile) -> np.ndarray:
+    """
+    Load one decoded elevation tile, preferring the decoded .npy cache so
+    repeat runs skip both PNG inflate and RGB->elevation arithmetic.
+    """
+    if client.cache:
+        decoded = client.cache.get_decoded(tile.zoom, tile.x, tile.y)
+        if decoded is not None:
+            return decoded
+
+    elevation = decode_terrain_rgb(client.fetch_tile(tile.zoom, tile.x, tile.y))
+    if client.cache:
+        client.cache.set_decoded(tile.zoom, tile.x, tile.y, elevation)
+    return elevation
+
+
+def create_heightmap_from_tiles(client: MapboxTileClient, tile_coords: list[RasterTile], stride: int = 1, verbose: bool = False) -> np.ndarray:
     """
     Fetch multiple tiles and stitch them into a single heightmap.
 
     Args:
         client: MapboxTileClient instance
         tile_coords: List of Tile instances
+        stride: Decimation step applied per tile while stitching, so only
+            the downsampled heightmap is ever allocated
+        verbose: Also log the elevation range (costs two full passes)
 
     Returns:
         2D numpy array of elevations in meters
@@ -22,30 +42,32 @@ def create_heightmap_from_tiles(client: MapboxTileClient, tile_coords: list[Rast
     if len(z_values) > 1:
         raise ValueError(f"All tiles must be at same zoom level, got: {z_values}")
 
-    # Fetch all tiles
-    tiles = {}
-    for tile in tile_coords:
-        print(f"Fetching tile {tile.zoom}/{tile.x}/{tile.y}...")
-        png_bytes = client.fetch_tile(tile.zoom, tile.x, tile.y)
-        tiles[(tile.x, tile.y)] = decode_terrain_rgb(png_bytes)
-
-    # Find grid bounds
-    xs = [x for x, _ in tiles.keys()]
-    ys = [y for _, y in tiles.keys()]
+    # Grid bounds are known from the tile coordinates up front
+    xs = [tile.x for tile in tile_coords]
+    ys = [tile.y for tile in tile_coords]
     min_x, max_x = min(xs), max(xs)
     min_y, max_y = min(ys), max(ys)
 
-    # Stitch tiles together
-    height = (max_y - min_y + 1) * 256
-    width = (max_x - min_x + 1) * 256
-    heightmap = np.zeros((height, width), dtype=np.float32)
+    # Preallocate the stitched mosaic, decimated by stride. Every slot gets
+    # written, so skip zero-filling.
+    tile_size = -(-256 // stride)
+    height = (max_y - min_y + 1) * tile_size
+    width = (max_x - min_x + 1) * tile_size
+    heightmap = np.empty((height, width), dtype=np.float32)
 
-    for (x, y), tile_data in tiles.items():
-        row = y - min_y
-        col = x - min_x
-        heightmap[row * 256 : (row + 1) * 256, col * 256 : (col + 1) * 256] = tile_data
+    # Fetch and decode tiles concurrently, streaming each one directly into
+    # its mosaic slot and dropping it — no dict of full-resolution tiles
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {executor.submit(_load_tile, client, tile): tile for tile in tile_coords}
+        for future in as_completed(futures):
+            tile = futures[future]
+            print(f"Fetched tile {tile.zoom}/{tile.x}/{tile.y}")
+            row = tile.y - min_y
+            col = tile.x - min_x
+            np.copyto(heightmap[row * tile_size : (row + 1) * tile_size, col * tile_size : (col + 1) * tile_size], future.result()[::stride, ::stride])
 
-    print(f"Created heightmap: {heightmap.shape} ({len(tiles)} tiles)")
-    print(f"Elevation range: {heightmap.min():.1f}m to {heightmap.max():.1f}m")
+    print(f"Created heightmap: {heightmap.shape} ({len(tile_coords)} tiles)")
+    if verbose:
+        print(f"Elevation range: {heightmap.min():.1f}m to {heightmap.max():.1f}m")
 
     return heightmap
@@ -2,7 +2,7 @@ from __future__ import annotations
 import click
 from coordinate_transform import LonLatToENU, LonLatToRasterTile
 from route import Route_LL, BBox_LL, ZoomLevel, Route_ENU
-from tile_client import MapboxTileClient, TileCache
+from tile_client import MapboxTileClient, SQLiteTileCache
 from heightmap import create_heightmap_from_tiles
 from parameters import GlobalParameters, ModelResolution
 from terrain_data import Terrain_ENU
@@ -16,7 +16,7 @@ from visualization import VisualizationBuilder
 @click.option("--model-size", "-s", default=100.0, help="Target model size in mm (default: 100)")
 @click.option("--resolution", "-r", default=0.2, help="Target print resolution in mm (default: 0.2)")
 def main(file_path: str, manual_zoom: int | None, model_size: float, resolution: float) -> None:
-    client = MapboxTileClient(access_token="pk.eyJ1IjoiaGFycnljYWlyYSIsImEiOiJjbWlzeWk4NmwwcmxtM2ZxeTZycGY2b2JqIn0.U2wkVaheUTFwrhiwBzLX3Q", cache=TileCache("./terrain_cache"))
+    client = MapboxTileClient(access_token="pk.eyJ1IjoiaGFycnljYWlyYSIsImEiOiJjbWlzeWk4NmwwcmxtM2ZxeTZycGY2b2JqIn0.U2wkVaheUTFwrhiwBzLX3Q", cache=SQLiteTileCache("./terrain_cache.sqlite"))
 
     params = GlobalParameters(SIZE_MM=model_size, PRINT_RESOLUTION_MM=resolution)
     
@@ -28,7 +28,13 @@ def main(file_path: str, manual_zoom: int | None, model_size: float, resolution:
     
     ll_to_rt = LonLatToRasterTile()
     tiles = bbox_ll.tiles_to_cover(zoom.value, transform=ll_to_rt)
-    heightmap = create_heightmap_from_tiles(client, tiles)
+
+    # Stitch at ~2x the mesh grid resolution rather than full tile resolution,
+    # so the full-size mosaic is never allocated
+    num_tiles_x = len({tile.x for tile in tiles})
+    num_tiles_y = len({tile.y for tile in tiles})
+    stride = max(1, (256 * max(num_tiles_x, num_tiles_y)) // 1000)
+    heightmap = create_heightmap_from_tiles(client, tiles, stride=stride)
 
     ll_to_enu = LonLatToENU.new(origin=route_ll.origin)
     route_enu = Route_ENU.new(route=route_ll, transform=ll_to_enu)
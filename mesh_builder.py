@@ -1,8 +1,37 @@
 from __future__ import annotations
+import math
 import numpy as np
 import trimesh
 from typing import Tuple
 
+try:
+    from scipy.spatial import cKDTree
+except (ImportError, ModuleNotFoundError):
+    cKDTree = None
+
+try:
+    from numba import njit, prange
+except (ImportError, ModuleNotFoundError):
+    njit = None
+
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _carve_route_numba(terrain_e, terrain_n, terrain_u, route_e, route_n, route_width, route_depth):
+        half = route_width * 0.5
+        for i in prange(terrain_e.shape[0]):
+            for j in range(terrain_e.shape[1]):
+                min_d2 = 1e30
+                for k in range(route_e.shape[0]):
+                    de = route_e[k] - terrain_e[i, j]
+                    dn = route_n[k] - terrain_n[i, j]
+                    d2 = de * de + dn * dn
+                    if d2 < min_d2:
+                        min_d2 = d2
+                if min_d2 < half * half:
+                    terrain_u[i, j] -= route_depth * (1.0 - math.sqrt(min_d2) / half)
+
 
 def create_terrain_mesh(
     terrain_e: np.ndarray,
@@ -38,42 +67,39 @@ def create_terrain_mesh(
     if route_e is not None and route_n is not None and route_u is not None:
         print(f"Adding route to terrain ({len(route_e)} points, width={route_width}m, height={'raised' if route_depth < 0 else 'carved'} {abs(route_depth)}m)...")
 
-        # For each terrain point, check if it's near the route
-        for i in range(height):
-            for j in range(width):
-                te, tn = terrain_e[i, j], terrain_n[i, j]
-
-                # Find minimum distance to route
-                distances = np.sqrt((route_e - te) ** 2 + (route_n - tn) ** 2)
-                min_dist = distances.min()
-
-                # If within route width, modify elevation
-                if min_dist < route_width / 2:
-                    # Smoothly interpolate height based on distance
-                    factor = 1.0 - (min_dist / (route_width / 2))
-                    # Negative route_depth means raised (subtract negative = add)
-                    terrain_u[i, j] -= route_depth * factor
+        if cKDTree is not None:
+            # Nearest route distance for every terrain point in one KD-tree query
+            route_points = np.column_stack([route_e, route_n])
+            tree = cKDTree(route_points)
+
+            terrain_points = np.column_stack([terrain_e.ravel(), terrain_n.ravel()])
+            min_dist, _ = tree.query(terrain_points, k=1, workers=-1)
+            min_dist = min_dist.reshape(terrain_u.shape)
+
+            # Within route width, smoothly interpolate height based on distance
+            mask = min_dist < route_width / 2
+            factor = 1.0 - min_dist[mask] / (route_width / 2)
+            # Negative route_depth means raised (subtract negative = add)
+            terrain_u[mask] -= route_depth * factor
+        elif njit is not None:
+            # Fallback: JIT-compiled brute-force scan, parallel over rows
+            _carve_route_numba(terrain_e, terrain_n, terrain_u, np.asarray(route_e, dtype=float), np.asarray(route_n, dtype=float), float(route_width), float(route_depth))
+        else:
+            raise ImportError("Route carving requires scipy or numba. Install with: pip install scipy")
 
     # Create vertices for the top surface
-    vertices = []
-    for i in range(height):
-        for j in range(width):
-            vertices.append([terrain_e[i, j], terrain_n[i, j], terrain_u[i, j]])
-
-    vertices = np.array(vertices)
+    vertices = np.stack([terrain_e, terrain_n, terrain_u], axis=-1).reshape(-1, 3)
 
     # Create triangular faces for the top surface using Delaunay-like grid
-    faces = []
-    for i in range(height - 1):
-        for j in range(width - 1):
-            # Two triangles per grid square
-            idx = i * width + j
-            # Triangle 1
-            faces.append([idx, idx + width, idx + 1])
-            # Triangle 2
-            faces.append([idx + 1, idx + width, idx + width + 1])
-
-    faces = np.array(faces)
+    # Two triangles per grid square, built from the flattened corner indices
+    i, j = np.mgrid[0 : height - 1, 0 : width - 1]
+    idx = (i * width + j).ravel()
+    tri1 = np.stack([idx, idx + width, idx + 1], axis=1)
+    tri2 = np.stack([idx + 1, idx + width, idx + width + 1], axis=1)
+
+    faces = np.empty((2 * len(idx), 3), dtype=np.int64)
+    faces[0::2] = tri1
+    faces[1::2] = tri2
 
     # Create the top surface mesh
     top_mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
@@ -92,49 +118,34 @@ def create_terrain_mesh(
     # Offset bottom face indices
     bottom_faces += len(vertices)
 
-    # Create side walls by connecting edges
-    side_faces = []
+    # Create side walls by connecting perimeter edges, one array build per edge
+    num_vertices = len(vertices)
+    i = np.arange(height - 1)
+    j = np.arange(width - 1)
 
-    # Connect edges around the perimeter
     # Top edge (j=width-1)
-    for i in range(height - 1):
-        top_idx1 = i * width + (width - 1)
-        top_idx2 = (i + 1) * width + (width - 1)
-        bot_idx1 = top_idx1 + len(vertices)
-        bot_idx2 = top_idx2 + len(vertices)
-        side_faces.append([top_idx1, bot_idx1, top_idx2])
-        side_faces.append([top_idx2, bot_idx1, bot_idx2])
+    top1 = i * width + (width - 1)
+    top2 = (i + 1) * width + (width - 1)
+    top_edge = np.vstack([np.column_stack([top1, top1 + num_vertices, top2]), np.column_stack([top2, top1 + num_vertices, top2 + num_vertices])])
 
     # Right edge (i=height-1)
-    for j in range(width - 1):
-        top_idx1 = (height - 1) * width + j
-        top_idx2 = (height - 1) * width + (j + 1)
-        bot_idx1 = top_idx1 + len(vertices)
-        bot_idx2 = top_idx2 + len(vertices)
-        side_faces.append([top_idx1, top_idx2, bot_idx1])
-        side_faces.append([top_idx2, bot_idx2, bot_idx1])
+    top1 = (height - 1) * width + j
+    top2 = (height - 1) * width + (j + 1)
+    right_edge = np.vstack([np.column_stack([top1, top2, top1 + num_vertices]), np.column_stack([top2, top2 + num_vertices, top1 + num_vertices])])
 
     # Bottom edge (j=0)
-    for i in range(height - 1):
-        top_idx1 = i * width
-        top_idx2 = (i + 1) * width
-        bot_idx1 = top_idx1 + len(vertices)
-        bot_idx2 = top_idx2 + len(vertices)
-        side_faces.append([top_idx1, top_idx2, bot_idx1])
-        side_faces.append([top_idx2, bot_idx2, bot_idx1])
+    top1 = i * width
+    top2 = (i + 1) * width
+    bottom_edge = np.vstack([np.column_stack([top1, top2, top1 + num_vertices]), np.column_stack([top2, top2 + num_vertices, top1 + num_vertices])])
 
     # Left edge (i=0)
-    for j in range(width - 1):
-        top_idx1 = j
-        top_idx2 = j + 1
-        bot_idx1 = top_idx1 + len(vertices)
-        bot_idx2 = top_idx2 + len(vertices)
-        side_faces.append([top_idx1, bot_idx1, top_idx2])
-        side_faces.append([top_idx2, bot_idx1, bot_idx2])
+    top1 = j
+    top2 = j + 1
+    left_edge = np.vstack([np.column_stack([top1, top1 + num_vertices, top2]), np.column_stack([top2, top1 + num_vertices, top2 + num_vertices])])
 
     # Combine all vertices and faces
     all_vertices = np.vstack([vertices, base_vertices])
-    all_faces = np.vstack([faces, bottom_faces, np.array(side_faces)])
+    all_faces = np.vstack([faces, bottom_faces, top_edge, right_edge, bottom_edge, left_edge])
 
     # Create the complete mesh
     mesh = trimesh.Trimesh(vertices=all_vertices, faces=all_faces, process=True)
@@ -227,71 +238,58 @@ def create_route_ribbon_mesh(
     if n_points < 2:
         raise ValueError("Route must have at least 2 points")
 
-    vertices = []
-    faces = []
-
-    # Create top and bottom surfaces
-    for i in range(n_points):
-        pos = np.array([route_e[i], route_n[i], route_u[i] + height])
-
-        # Calculate perpendicular direction using average of adjacent segments
-        if i == 0:
-            forward = np.array([route_e[1] - route_e[0], route_n[1] - route_n[0], 0])
-        elif i == n_points - 1:
-            forward = np.array([route_e[i] - route_e[i - 1], route_n[i] - route_n[i - 1], 0])
-        else:
-            forward = np.array([route_e[i + 1] - route_e[i - 1], route_n[i + 1] - route_n[i - 1], 0])
-
-        forward_len = np.linalg.norm(forward)
-        if forward_len > 0:
-            forward = forward / forward_len
-        else:
-            forward = np.array([1, 0, 0])
-
-        # Perpendicular is 90° rotation in XY plane
-        perpendicular = np.array([-forward[1], forward[0], 0])
-
-        # Create 4 vertices per position: top-left, top-right, bottom-left, bottom-right
-        top_left = pos - perpendicular * (width / 2)
-        top_right = pos + perpendicular * (width / 2)
-        bottom_left = top_left - np.array([0, 0, thickness])
-        bottom_right = top_right - np.array([0, 0, thickness])
-
-        vertices.extend([top_left, top_right, bottom_left, bottom_right])
-
-        # Create faces connecting to previous segment
-        if i > 0:
-            prev_base = (i - 1) * 4
-            curr_base = i * 4
-
-            # Top surface (2 triangles)
-            faces.append([prev_base, curr_base, prev_base + 1])
-            faces.append([prev_base + 1, curr_base, curr_base + 1])
-
-            # Bottom surface (2 triangles, reversed winding)
-            faces.append([prev_base + 2, prev_base + 3, curr_base + 2])
-            faces.append([prev_base + 3, curr_base + 3, curr_base + 2])
-
-            # Left edge (2 triangles)
-            faces.append([prev_base, prev_base + 2, curr_base])
-            faces.append([prev_base + 2, curr_base + 2, curr_base])
-
-            # Right edge (2 triangles)
-            faces.append([prev_base + 1, curr_base + 1, prev_base + 3])
-            faces.append([prev_base + 3, curr_base + 1, curr_base + 3])
+    positions = np.column_stack([route_e, route_n, route_u + height])
+
+    # Tangent direction in the XY plane: central differences for interior
+    # points, one-sided differences at the endpoints
+    forward = np.zeros((n_points, 3))
+    forward[1:-1, 0] = route_e[2:] - route_e[:-2]
+    forward[1:-1, 1] = route_n[2:] - route_n[:-2]
+    forward[0] = [route_e[1] - route_e[0], route_n[1] - route_n[0], 0]
+    forward[-1] = [route_e[-1] - route_e[-2], route_n[-1] - route_n[-2], 0]
+
+    forward_len = np.linalg.norm(forward, axis=1, keepdims=True)
+    forward = np.where(forward_len > 0, forward / np.where(forward_len > 0, forward_len, 1), [1, 0, 0])
+
+    # Perpendicular is 90° rotation in XY plane
+    perpendicular = np.column_stack([-forward[:, 1], forward[:, 0], np.zeros(n_points)])
+
+    # Create 4 vertices per position: top-left, top-right, bottom-left, bottom-right
+    top_left = positions - perpendicular * (width / 2)
+    top_right = positions + perpendicular * (width / 2)
+    bottom_left = top_left - np.array([0, 0, thickness])
+    bottom_right = top_right - np.array([0, 0, thickness])
+
+    vertices = np.stack([top_left, top_right, bottom_left, bottom_right], axis=1).reshape(-1, 3)
+
+    # Faces connecting each segment to the previous one: top and bottom
+    # surfaces plus left and right edges, 8 triangles per segment
+    segment_faces = np.array(
+        [
+            [0, 4, 1],
+            [1, 4, 5],
+            [2, 3, 6],
+            [3, 7, 6],
+            [0, 2, 4],
+            [2, 6, 4],
+            [1, 5, 3],
+            [3, 5, 7],
+        ]
+    )
+    segment_base = 4 * np.arange(n_points - 1)
+    faces = (segment_base[:, None, None] + segment_faces[None, :, :]).reshape(-1, 3)
 
     # Add end caps
-    # Start cap (4 triangles forming a rectangle)
-    faces.append([0, 2, 1])
-    faces.append([1, 2, 3])
-
-    # End cap (4 triangles forming a rectangle)
     last_base = (n_points - 1) * 4
-    faces.append([last_base, last_base + 1, last_base + 2])
-    faces.append([last_base + 1, last_base + 3, last_base + 2])
-
-    vertices = np.array(vertices)
-    faces = np.array(faces)
+    caps = np.array(
+        [
+            [0, 2, 1],
+            [1, 2, 3],
+            [last_base, last_base + 1, last_base + 2],
+            [last_base + 1, last_base + 3, last_base + 2],
+        ]
+    )
+    faces = np.vstack([faces, caps])
 
     # Create mesh with processing enabled
     mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=True)
@@ -16,17 +16,18 @@ class ZoomLevel:
 
     @classmethod
     def _compute_auto_zoom(cls, bbox: BBox_LL, params: GlobalParameters, model_res: ModelResolution, max_tiles: int = 1000) -> int:
-        optimum_zoom = 15
+        transform = LonLatToRasterTile()
         for zoom in range(1, 16):
             meters_per_pixel = (params.EARTH_CIRCUMFERENCE_M * math.cos(math.radians(bbox.central_latitude))) / (256 * (2**zoom))
-            tiles = bbox.tiles_to_cover(zoom, transform=LonLatToRasterTile())
-            num_tiles = len(tiles)
+            num_tiles = bbox.tile_count(zoom, transform=transform)
 
             if num_tiles > max_tiles:
                 break
-            if meters_per_pixel <= model_res.meters and num_tiles <= max_tiles:
-                optimum_zoom = zoom
-        return optimum_zoom
+            # meters_per_pixel shrinks monotonically with zoom, so the first
+            # zoom meeting the target resolution is the optimum
+            if meters_per_pixel <= model_res.meters:
+                return zoom
+        return 15
 
     @classmethod
     def new(cls, params: GlobalParameters, bbox: BBox_LL, manual_zoom: int | None, model_res: ModelResolution) -> ZoomLevel:
@@ -44,18 +45,15 @@ class Grid:
 
     @classmethod
     def new(cls, enu_coordinates: np.ndarray, transform: LonLatToENU) -> Grid:
-        num_n, num_e = enu_coordinates.shape
+        # The transform is shape-preserving, so feed the 2D grids directly
+        # instead of a ravel/reshape round-trip
+        e_grid = enu_coordinates[..., 0]
+        n_grid = enu_coordinates[..., 1]
+        u_grid = np.zeros_like(e_grid)
 
-        e_flat = enu_coordinates[:, :, 0].ravel()
-        n_flat = enu_coordinates[:, :, 1].ravel()
-        u_flat = np.zeros_like(e_flat)
+        lonlat_coords = transform.enu_to_lonlat(e_grid, n_grid, u_grid)
 
-        lonlat_coords = transform.enu_to_lonlat(e_flat, n_flat, u_flat)
-
-        lat_grid = lonlat_coords[:, 0].reshape((num_n, num_e))
-        lon_grid = lonlat_coords[:, 1].reshape((num_n, num_e))
-
-        return cls(lat_grid=lat_grid, lon_grid=lon_grid)
+        return cls(lat_grid=lonlat_coords[..., 0], lon_grid=lonlat_coords[..., 1])
 
 
 @dataclass(frozen=True)
@@ -77,6 +75,27 @@ class BBox_LL:
     def central_latitude(self) -> float:
         return (self.min_latitude + self.max_latitude) / 2
 
+    def _tile_ranges(self, zoom: int, transform: LonLatToRasterTile) -> Tuple[int, int, int, int]:
+        """
+        Tile index ranges (min_x, max_x, min_y, max_y) covering this bounding
+        box at the given zoom level. Only the two corner tiles are computed.
+        """
+        min_tile = transform.lonlat_to_tile(self.min_longitude, self.min_latitude, zoom)
+        max_tile = transform.lonlat_to_tile(self.max_longitude, self.max_latitude, zoom)
+
+        # In Web Mercator, y increases southward, so min_lat → max_y and max_lat → min_y
+        min_x, max_x = min(min_tile.x, max_tile.x), max(min_tile.x, max_tile.x)
+        min_y, max_y = min(min_tile.y, max_tile.y), max(min_tile.y, max_tile.y)
+        return min_x, max_x, min_y, max_y
+
+    def tile_count(self, zoom: int, transform: LonLatToRasterTile) -> int:
+        """
+        Count the tiles needed to cover this bounding box at the given zoom
+        level without materializing any RasterTile objects.
+        """
+        min_x, max_x, min_y, max_y = self._tile_ranges(zoom, transform)
+        return (max_x - min_x + 1) * (max_y - min_y + 1)
+
     def tiles_to_cover(self, zoom: int, transform: LonLatToRasterTile) -> list[RasterTile]:
         """
         Get all tile coordinates (z, x, y) needed to cover this bounding box at zoom level z.
@@ -87,18 +106,8 @@ class BBox_LL:
         Returns:
             List of Tiles
         """
-        min_tile = transform.lonlat_to_tile(self.min_longitude, self.min_latitude, zoom)
-        max_tile = transform.lonlat_to_tile(self.max_longitude, self.max_latitude, zoom)
-
-        # In Web Mercator, y increases southward, so min_lat → max_y and max_lat → min_y
-        min_x, max_x = min(min_tile.x, max_tile.x), max(min_tile.x, max_tile.x)
-        min_y, max_y = min(min_tile.y, max_tile.y), max(min_tile.y, max_tile.y)
-
-        tiles = []
-        for x in range(min_x, max_x + 1):
-            for y in range(min_y, max_y + 1):
-                tiles.append(RasterTile(zoom, x, y))
-        return tiles
+        min_x, max_x, min_y, max_y = self._tile_ranges(zoom, transform)
+        return [RasterTile(zoom, x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
 
     @classmethod
     def new(cls, bounds: Bounds) -> BBox_LL:
@@ -155,11 +164,12 @@ class Route_LL:
 
     @property
     def bounds(self) -> Bounds:
+        # min/max were computed once in new(); no need to rescan the arrays
         return Bounds(
-            min_latitude=float(self.latitudes.min()),
-            min_longitude=float(self.longitudes.min()),
-            max_latitude=float(self.latitudes.max()),
-            max_longitude=float(self.longitudes.max()),
+            min_latitude=self.min_latitude,
+            min_longitude=self.min_longitude,
+            max_latitude=self.max_latitude,
+            max_longitude=self.max_longitude,
         )
 
     @classmethod
@@ -172,9 +182,11 @@ class Route_LL:
 
         segment = gpx.tracks[0].segments[0]
 
-        lats = np.array([p.lat for p in segment.points], dtype=float)
-        lons = np.array([p.lon for p in segment.points], dtype=float)
-        ele = np.array([p.ele for p in segment.points], dtype=float)
+        # Fill preallocated arrays directly, no intermediate Python lists
+        num_points = len(segment.points)
+        lats = np.fromiter((p.lat for p in segment.points), dtype=float, count=num_points)
+        lons = np.fromiter((p.lon for p in segment.points), dtype=float, count=num_points)
+        ele = np.fromiter((p.ele for p in segment.points), dtype=float, count=num_points)
         return cls(
             latitudes=lats,
             longitudes=lons,
@@ -1,9 +1,51 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import math
 import numpy as np
 from scipy.spatial import cKDTree
 from coordinate_transform import LonLatToENU
 
+try:
+    from numba import njit, prange
+except (ImportError, ModuleNotFoundError):
+    njit = None
+
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _tile_to_latlon(height, width, tile_x_min, tile_y_min, pixels_per_tile, n):
+        # Fused pixel -> tile -> lat/lon conversion: one pass, no meshgrid
+        # or trig temporaries. The trig runs in registers and only the two
+        # float32 output arrays are ever materialized.
+        lat_flat = np.empty(height * width, dtype=np.float32)
+        lon_flat = np.empty(height * width, dtype=np.float32)
+        for i in prange(height):
+            tile_y = tile_y_min + i / pixels_per_tile
+            lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+            for j in range(width):
+                tile_x = tile_x_min + j / pixels_per_tile
+                idx = i * width + j
+                lat_flat[idx] = lat
+                lon_flat[idx] = tile_x / n * 360.0 - 180.0
+        return lat_flat, lon_flat
+
+    @njit(parallel=True, cache=True)
+    def _bounds6(e, n, u):
+        # All six min/max reductions in a single sweep over the grids
+        e_min, e_max = np.inf, -np.inf
+        n_min, n_max = np.inf, -np.inf
+        u_min, u_max = np.inf, -np.inf
+        for i in prange(e.shape[0]):
+            for j in range(e.shape[1]):
+                e_min = min(e_min, e[i, j])
+                e_max = max(e_max, e[i, j])
+                n_min = min(n_min, n[i, j])
+                n_max = max(n_max, n[i, j])
+                u_min = min(u_min, u[i, j])
+                u_max = max(u_max, u[i, j])
+        return e_min, e_max, n_min, n_max, u_min, u_max
+
 
 @dataclass(frozen=True)
 class Terrain_ENU:
@@ -14,20 +56,47 @@ class Terrain_ENU:
     - Convert heightmap from tile coordinates to ENU
     - Store terrain grids (E, N, U)
     - Provide terrain bounds information
+
+    The grid comes from a regular tile pyramid, so when the tile origin and
+    transform are known, nearest-neighbor sampling inverts the Web Mercator
+    projection analytically instead of building a KD-tree.
     """
 
     e_grid: np.ndarray
     n_grid: np.ndarray
     u_grid: np.ndarray
 
+    transform: LonLatToENU | None = None
+    zoom: int | None = None
+    tile_x_min: int | None = None
+    tile_y_min: int | None = None
+    pixels_per_tile: float = 256.0
+    pixel_offset: float = 0.0
+
+    # Lazily built KD-tree for the no-metadata fallback in sample_at_points
+    _tree: cKDTree | None = field(default=None, repr=False, compare=False)
+
+    # Memoized result of the bounds property; grids never change
+    _bounds_cache: tuple | None = field(default=None, repr=False, compare=False)
+
     @property
     def bounds(self) -> tuple[tuple[float, float], tuple[float, float], tuple[float, float]]:
         """Returns ((e_min, e_max), (n_min, n_max), (u_min, u_max))"""
-        return (
-            (float(self.e_grid.min()), float(self.e_grid.max())),
-            (float(self.n_grid.min()), float(self.n_grid.max())),
-            (float(self.u_grid.min()), float(self.u_grid.max())),
-        )
+        if self._bounds_cache is not None:
+            return self._bounds_cache
+
+        if njit is not None:
+            e_min, e_max, n_min, n_max, u_min, u_max = _bounds6(self.e_grid, self.n_grid, self.u_grid)
+            result = ((float(e_min), float(e_max)), (float(n_min), float(n_max)), (float(u_min), float(u_max)))
+        else:
+            result = (
+                (float(self.e_grid.min()), float(self.e_grid.max())),
+                (float(self.n_grid.min()), float(self.n_grid.max())),
+                (float(self.u_grid.min()), float(self.u_grid.max())),
+            )
+
+        object.__setattr__(self, "_bounds_cache", result)
+        return result
 
     @property
     def shape(self) -> tuple[int, int]:
@@ -45,11 +114,31 @@ class Terrain_ENU:
         Returns:
             Array of elevation values at the given points
         """
-        terrain_points = np.column_stack([self.e_grid.ravel(), self.n_grid.ravel()])
-        tree = cKDTree(terrain_points)
+        height, width = self.shape
+
+        if self.transform is not None:
+            # Invert the regular tile grid analytically: ENU -> lat/lon ->
+            # fractional tile coordinates -> nearest pixel row/col
+            lonlat = self.transform.enu_to_lonlat(e_points, n_points, np.zeros_like(e_points, dtype=float))
+            lat_rad = np.radians(lonlat[..., 0])
+            lon = lonlat[..., 1]
+
+            n = 2**self.zoom
+            x_tile = (lon + 180.0) / 360.0 * n
+            y_tile = (1.0 - np.arcsinh(np.tan(lat_rad)) / np.pi) / 2.0 * n
+
+            col = np.clip(np.rint((x_tile - self.tile_x_min) * self.pixels_per_tile - self.pixel_offset).astype(np.int64), 0, width - 1)
+            row = np.clip(np.rint((y_tile - self.tile_y_min) * self.pixels_per_tile - self.pixel_offset).astype(np.int64), 0, height - 1)
+            return self.u_grid[row, col]
+
+        # Fallback for grids without tile metadata (e.g. downsampled copies).
+        # The tree is built once and cached on the frozen instance.
+        if self._tree is None:
+            terrain_points = np.column_stack([self.e_grid.ravel(), self.n_grid.ravel()])
+            object.__setattr__(self, "_tree", cKDTree(terrain_points))
 
         query_points = np.column_stack([e_points, n_points])
-        _, indices = tree.query(query_points)
+        _, indices = self._tree.query(query_points, workers=-1)
 
         return self.u_grid.ravel()[indices]
 
@@ -65,8 +154,31 @@ class Terrain_ENU:
         """
         height, width = self.shape
         step = max(1, max(height, width) // target_size)
-
-        return Terrain_ENU(e_grid=self.e_grid[::step, ::step], n_grid=self.n_grid[::step, ::step], u_grid=self.u_grid[::step, ::step])
+        if step == 1:
+            return self
+
+        # Block-average instead of strided decimation: one sequential pass
+        # per grid and no aliasing of high-frequency terrain features
+        h_trim = (height // step) * step
+        w_trim = (width // step) * step
+
+        def block_mean(grid: np.ndarray) -> np.ndarray:
+            return grid[:h_trim, :w_trim].reshape(height // step, step, width // step, step).mean(axis=(1, 3))
+
+        # Carry the tile metadata along with scaled pixel density (and the
+        # half-block center shift from averaging), so sampling on the
+        # downsampled grid still uses the analytic index, never the KD-tree
+        return Terrain_ENU(
+            e_grid=block_mean(self.e_grid),
+            n_grid=block_mean(self.n_grid),
+            u_grid=block_mean(self.u_grid),
+            transform=self.transform,
+            zoom=self.zoom,
+            tile_x_min=self.tile_x_min,
+            tile_y_min=self.tile_y_min,
+            pixels_per_tile=self.pixels_per_tile / step,
+            pixel_offset=self.pixel_offset / step + (step - 1) / (2 * step),
+        )
 
     @classmethod
     def new(cls, heightmap: np.ndarray, tiles: list, zoom: int, transform: LonLatToENU) -> Terrain_ENU:
@@ -85,40 +197,49 @@ class Terrain_ENU:
         print("Converting heightmap to ENU coordinates...")
         height, width = heightmap.shape
 
-        # Get tile bounds
-        tile_xs = [tile.x for tile in tiles]
-        tile_ys = [tile.y for tile in tiles]
-        tile_x_min = min(tile_xs)
-        tile_y_min = min(tile_ys)
-
-        # Create meshgrid for all pixel coordinates
-        rows, cols = np.meshgrid(np.arange(height), np.arange(width), indexing="ij")
+        # Get tile bounds (lazy generators, no intermediate lists)
+        tile_x_min = min(tile.x for tile in tiles)
+        tile_x_max = max(tile.x for tile in tiles)
+        tile_y_min = min(tile.y for tile in tiles)
 
-        # Convert pixels to tile coordinates (vectorized)
-        tile_x_grid = tile_x_min + cols / 256.0
-        tile_y_grid = tile_y_min + rows / 256.0
+        # Pixels per tile follows from the heightmap shape, so a heightmap
+        # stitched with a decimating stride stays correctly georeferenced
+        pixels_per_tile = width / (tile_x_max - tile_x_min + 1)
 
-        # Convert tile coordinates to lat/lon (vectorized)
         n = 2**zoom
-        lon_grid = tile_x_grid / n * 360.0 - 180.0
-        lat_rad_grid = np.arctan(np.sinh(np.pi * (1 - 2 * tile_y_grid / n)))
-        lat_grid = np.degrees(lat_rad_grid)
-
-        # Flatten for batch conversion to ENU
-        lat_flat = lat_grid.ravel()
-        lon_flat = lon_grid.ravel()
+        if njit is not None:
+            # Single fused pass over the grid, parallel over rows
+            lat_flat, lon_flat = _tile_to_latlon(height, width, tile_x_min, tile_y_min, pixels_per_tile, n)
+        else:
+            # Pixel -> tile coordinates as 1-D vectors; broadcasting expands
+            # them to the full grid only at the final lat/lon step
+            tile_x_vec = tile_x_min + np.arange(width) / pixels_per_tile
+            tile_y_vec = tile_y_min + np.arange(height) / pixels_per_tile
+
+            # Convert tile coordinates to lat/lon (vectorized)
+            lon_vec = tile_x_vec / n * 360.0 - 180.0
+            lat_vec = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * tile_y_vec / n))))
+
+            lat_flat = np.broadcast_to(lat_vec[:, None], (height, width)).ravel()
+            lon_flat = np.broadcast_to(lon_vec[None, :], (height, width)).ravel()
+
+        # Flatten elevations for batch conversion to ENU
         ele_flat = heightmap.ravel()
 
         # Batch convert to ENU
         enu_coords = transform.lonlat_to_enu(lat_flat, lon_flat, ele_flat)
 
-        # Reshape back to 2D grids
-        e_grid = enu_coords[:, 0].reshape(height, width)
-        n_grid = enu_coords[:, 1].reshape(height, width)
+        # Reshape back to 2D grids; float32 matches the heightmap and halves
+        # bandwidth for every downstream sample/plot pass (no-op copy when
+        # the transform already emitted float32)
+        e_grid = enu_coords[:, 0].reshape(height, width).astype(np.float32, copy=False)
+        n_grid = enu_coords[:, 1].reshape(height, width).astype(np.float32, copy=False)
         u_grid = heightmap.copy()
 
+        terrain = cls(e_grid=e_grid, n_grid=n_grid, u_grid=u_grid, transform=transform, zoom=zoom, tile_x_min=tile_x_min, tile_y_min=tile_y_min, pixels_per_tile=pixels_per_tile)
+
         print("ENU conversion complete!")
-        e_bounds, n_bounds, _ = cls(e_grid, n_grid, u_grid).bounds
+        e_bounds, n_bounds, _ = terrain.bounds
         print(f"Terrain ENU bounds: E=[{e_bounds[0]:.1f}, {e_bounds[1]:.1f}], N=[{n_bounds[0]:.1f}, {n_bounds[1]:.1f}]")
 
-        return cls(e_grid=e_grid, n_grid=n_grid, u_grid=u_grid)
+        return terrain
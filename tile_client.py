@@ -1,5 +1,9 @@
+import functools
 import io
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from typing import Optional
 from pathlib import Path
@@ -7,6 +11,16 @@ from requests.adapters import HTTPAdapter, Retry
 import numpy as np
 from PIL import Image
 
+try:
+    import pyspng
+except (ImportError, ModuleNotFoundError):
+    pyspng = None
+
+try:
+    import httpx
+except (ImportError, ModuleNotFoundError):
+    httpx = None
+
 
 class TileCache:
     """
@@ -14,24 +28,91 @@ class TileCache:
     Stores tiles in `<cache_dir>/<z>/<x>/<y>.png`.
     """
 
-    def __init__(self, cache_dir: str = ".tile_cache"):
+    def __init__(self, cache_dir: str = ".tile_cache", lru_size: int = 2048):
         self.root = Path(cache_dir)
         self.root.mkdir(parents=True, exist_ok=True)
 
+        # In-memory LRU over disk reads; ~30 KB per PNG caps this at ~60 MB.
+        # Misses raise, so lru_cache never memoizes absent tiles and set()
+        # needs no invalidation.
+        self._read_cached = functools.lru_cache(maxsize=lru_size)(self._read)
+
+        # Directories already created this session, so _path stays a pure
+        # string join instead of a mkdir syscall per access
+        self._created_dirs: set[Path] = set()
+
     def _path(self, z: int, x: int, y: int) -> Path:
         p = self.root / str(z) / str(x)
-        p.mkdir(parents=True, exist_ok=True)
+        if p not in self._created_dirs:
+            p.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(p)
         return p / f"{y}.png"
 
+    def _read(self, z: int, x: int, y: int) -> bytes:
+        return self._path(z, x, y).read_bytes()
+
     def get(self, z: int, x: int, y: int) -> Optional[bytes]:
+        try:
+            return self._read_cached(z, x, y)
+        except FileNotFoundError:
+            return None
+
+    def set(self, z: int, x: int, y: int, data: bytes) -> None:
         path = self._path(z, x, y)
+        path.write_bytes(data)
+
+    def get_decoded(self, z: int, x: int, y: int) -> Optional[np.ndarray]:
+        """
+        Fetch a decoded elevation tile (stored as .npy next to the PNG).
+        Memory-mapped, so no bytes are read until the tile is stitched.
+        """
+        path = self._path(z, x, y).with_suffix(".npy")
         if path.exists():
-            return path.read_bytes()
+            return np.load(path, mmap_mode="r")
         return None
 
+    def set_decoded(self, z: int, x: int, y: int, elevation: np.ndarray) -> None:
+        np.save(self._path(z, x, y).with_suffix(".npy"), elevation)
+
+
+class SQLiteTileCache:
+    """
+    Tile cache backed by a single SQLite database (MBTiles-style schema).
+    One file handle and one indexed SELECT per tile instead of a
+    stat/open/read against a deep z/x/y directory tree.
+    Same interface as TileCache, safe for the fetch thread pool.
+    """
+
+    def __init__(self, db_path: str = ".tile_cache.sqlite"):
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS tiles (z INTEGER, x INTEGER, y INTEGER, data BLOB, PRIMARY KEY (z, x, y))")
+        self.db.execute("CREATE TABLE IF NOT EXISTS decoded_tiles (z INTEGER, x INTEGER, y INTEGER, data BLOB, PRIMARY KEY (z, x, y))")
+        self.db.commit()
+        self._lock = threading.Lock()
+
+    def get(self, z: int, x: int, y: int) -> Optional[bytes]:
+        with self._lock:
+            row = self.db.execute("SELECT data FROM tiles WHERE z=? AND x=? AND y=?", (z, x, y)).fetchone()
+        return row[0] if row else None
+
     def set(self, z: int, x: int, y: int, data: bytes) -> None:
-        path = self._path(z, x, y)
-        path.write_bytes(data)
+        with self._lock:
+            self.db.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", (z, x, y, data))
+            self.db.commit()
+
+    def get_decoded(self, z: int, x: int, y: int) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self.db.execute("SELECT data FROM decoded_tiles WHERE z=? AND x=? AND y=?", (z, x, y)).fetchone()
+        if row is None:
+            return None
+        return np.load(io.BytesIO(row[0]))
+
+    def set_decoded(self, z: int, x: int, y: int, elevation: np.ndarray) -> None:
+        buffer = io.BytesIO()
+        np.save(buffer, elevation)
+        with self._lock:
+            self.db.execute("INSERT OR REPLACE INTO decoded_tiles VALUES (?, ?, ?, ?)", (z, x, y, buffer.getvalue()))
+            self.db.commit()
 
 
 class MapboxTileClient:
@@ -49,23 +130,38 @@ class MapboxTileClient:
         self.token = access_token
         self.cache = cache
 
-        # HTTP session with retry strategy
-        retry = Retry(
-            total=5,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-        )
-        adapter = HTTPAdapter(max_retries=retry)
-
-        self.http = requests.Session()
-        self.http.mount("https://", adapter)
+        # Prefer HTTP/2 via httpx: many small tile responses multiplex over
+        # one connection with no head-of-line blocking. The response API
+        # (status_code/headers/content/text) matches requests, so the fetch
+        # path is client-agnostic.
+        self.http = None
+        if httpx is not None:
+            try:
+                transport = httpx.HTTPTransport(retries=5, http2=True, limits=httpx.Limits(max_connections=20))
+                self.http = httpx.Client(transport=transport)
+            except ImportError:
+                # httpx installed without the h2 extra
+                self.http = None
+
+        if self.http is None:
+            # HTTP/1.1 session with retry strategy
+            retry = Retry(
+                total=5,
+                backoff_factor=1,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"],
+            )
+            # Pool sized to match fetch_tiles' default concurrency
+            adapter = HTTPAdapter(max_retries=retry, pool_connections=16, pool_maxsize=16)
+
+            self.http = requests.Session()
+            self.http.mount("https://", adapter)
 
     # ------------------------------
     # Public API
     # ------------------------------
 
-    def fetch_tile(self, z: int, x: int, y: int) -> bytes:
+    def fetch_tile(self, z: int, x: int, y: int, max_retries: int = 5) -> bytes:
         """
         Fetch a tile. Returns PNG bytes.
         Uses cache if available.
@@ -80,36 +176,61 @@ class MapboxTileClient:
         url = f"{self.BASE_URL}/{z}/{x}/{y}.pngraw"
         params = {"access_token": self.token}
 
-        response = self.http.get(url, params=params, timeout=10)
+        for _ in range(max_retries):
+            response = self.http.get(url, params=params, timeout=10)
 
-        # Handle rate limit backoff manually (429)
-        if response.status_code == 429:
-            retry_after = int(response.headers.get("Retry-After", 2))
-            time.sleep(retry_after)
-            return self.fetch_tile(z, x, y)
+            # Handle rate limit backoff manually (429), bounded by max_retries
+            if response.status_code == 429:
+                retry_after = int(response.headers.get("Retry-After", 2))
+                time.sleep(retry_after)
+                continue
 
-        if response.status_code != 200:
-            raise RuntimeError(f"Tile fetch failed [{response.status_code}]: {response.text}")
+            if response.status_code != 200:
+                raise RuntimeError(f"Tile fetch failed [{response.status_code}]: {response.text}")
 
-        data = response.content
+            data = response.content
 
-        # Save to cache
-        if self.cache:
-            self.cache.set(z, x, y, data)
+            # Save to cache
+            if self.cache:
+                self.cache.set(z, x, y, data)
 
-        return data
+            return data
+
+        raise RuntimeError(f"Tile fetch failed [429]: rate limited after {max_retries} attempts for {z}/{x}/{y}")
+
+    def fetch_tiles(self, coords: list[tuple[int, int, int]], max_workers: int = 16) -> list[bytes]:
+        """
+        Fetch many tiles concurrently. Returns PNG bytes in input order.
+
+        The shared session's connection pool handles the parallel requests;
+        the GIL is released during socket I/O, so fetches overlap.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda c: self.fetch_tile(*c), coords))
+
+
+# Per-channel lookup tables for Terrain-RGB decoding: the mapping is affine
+# in the packed 24-bit value, so elevation = lut_R[R] + lut_G[G] + lut_B[B].
+# 3 KB total, stays resident in L1.
+_LUT_R = np.arange(256, dtype=np.float32) * (65536 * 0.1)
+_LUT_G = np.arange(256, dtype=np.float32) * (256 * 0.1)
+_LUT_B = np.arange(256, dtype=np.float32) * 0.1 - 10000.0
 
 
 def decode_terrain_rgb(png_bytes: bytes) -> np.ndarray:
     """
     Convert Terrain-RGB PNG bytes into a 256x256 elevation matrix (meters).
     """
-    img = Image.open(io.BytesIO(png_bytes)).convert("RGB")
-    arr = np.asarray(img).astype(np.float32)
-
-    R = arr[:, :, 0]
-    G = arr[:, :, 1]
-    B = arr[:, :, 2]
-
-    elevation = -10000 + (R * 256 * 256 + G * 256 + B) * 0.1
+    if pyspng is not None:
+        # libspng decodes straight to a uint8 array and releases the GIL,
+        # so decoding parallelizes with the tile fetch thread pool
+        arr = pyspng.load(png_bytes)[:, :, :3]
+    else:
+        img = Image.open(io.BytesIO(png_bytes)).convert("RGB")
+
+        # Wrap the raw pixel buffer directly instead of np.asarray, which can
+        # copy the whole image again on its way out of PIL
+        arr = np.frombuffer(img.tobytes(), dtype=np.uint8).reshape(img.height, img.width, 3)
+
+    elevation = _LUT_R[arr[:, :, 0]] + _LUT_G[arr[:, :, 1]] + _LUT_B[arr[:, :, 2]]
     return elevation
@@ -48,12 +48,12 @@ class VisualizationBuilder:
         # Create figure
         fig = go.Figure()
 
-        # Add terrain surface
+        # Add terrain surface (float32 halves the serialized payload)
         fig.add_trace(
             go.Surface(
-                x=terrain_down.e_grid,
-                y=terrain_down.n_grid,
-                z=terrain_down.u_grid,
+                x=terrain_down.e_grid.astype(np.float32, copy=False),
+                y=terrain_down.n_grid.astype(np.float32, copy=False),
+                z=terrain_down.u_grid.astype(np.float32, copy=False),
                 colorscale="Earth",
                 colorbar=dict(title="Elevation (m)"),
                 lighting=dict(ambient=0.4, diffuse=0.8, specular=0.2, roughness=0.8, fresnel=0.2),
@@ -62,12 +62,13 @@ class VisualizationBuilder:
             )
         )
 
-        # Add route as 3D line
+        # Add route as 3D line, subsampled to keep the overlay under ~5000 points
+        route_step = max(1, len(self.route_enu.e) // 5000)
         fig.add_trace(
             go.Scatter3d(
-                x=self.route_enu.e,
-                y=self.route_enu.n,
-                z=self.route_terrain_elevation + 1,  # Slightly above terrain
+                x=self.route_enu.e[::route_step],
+                y=self.route_enu.n[::route_step],
+                z=self.route_terrain_elevation[::route_step] + 1,  # Slightly above terrain
                 mode="lines+markers",
                 line=dict(color="red", width=6),
                 marker=dict(size=3, color="red"),
@@ -99,6 +100,11 @@ class VisualizationBuilder:
         fig = self.create_3d_visualization(downsample_size=downsample_size)
         fig.show()
 
+    def save_html(self, path: str = "terrain.html", downsample_size: int = 500) -> None:
+        """Write the visualization to a standalone HTML file (plotly.js from CDN, no validation pass)."""
+        fig = self.create_3d_visualization(downsample_size=downsample_size)
+        fig.write_html(path, include_plotlyjs="cdn", validate=False)
+
     @classmethod
     def new(cls, terrain: Terrain_ENU, route_enu: EnuRoute, route_terrain_elevation: np.ndarray) -> VisualizationBuilder:
         """Create VisualizationBuilder from terrain and route data."""